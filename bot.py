@@ -2,27 +2,123 @@
 import discord
 from discord import app_commands, Activity, ActivityType
 from discord.ext import commands, tasks
+import asyncio
+import atexit
+import functools
+import hashlib
 import subprocess
 import re
+import copy
 import json
 import os
+import sys
+import time
+from collections import deque
 from datetime import datetime
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import aiohttp
 
+try:
+    import orjson  # Optional: faster JSON than the stdlib
+except ImportError:
+    orjson = None
+
 # Constants
 CONFIG_FILE = 'config.json' #name of the config file. The file will be created on the first run of the bot.
 TMUX_SESSION = 'arma_reforger' #give the name of the tmux session that is used for your game server
 LOG_FILE = 'bot.log' #Name of the log file. Created in the same directory
-
-# Set up logging
+POSTED_BANS_MAX = 10000 #Oldest posted-ban IDs are dropped beyond this to keep config.json bounded
+SYNC_HASH_FILE = '.command_sync_hash' #Fingerprint of the last synced command tree, used to skip redundant syncs
+
+# Pre-compiled patterns for the tmux output parsing on the monitor hot path
+_PLAYERS_RE = re.compile(r'Players connected: (\d+)')
+_FPS_RE = re.compile(r'FPS: ([\d.]+)')
+_FRAME_TIME_RE = re.compile(r'frame time \(avg: ([\d.]+) ms, min: ([\d.]+) ms, max: ([\d.]+) ms\)')
+_MEM_RE = re.compile(r'Mem: (\d+)')
+_AI_RE = re.compile(r'AI: (\d+)')
+_VEH_RE = re.compile(r'Veh: (\d+)\s*\(')
+_CLIENT_RE = re.compile(r'\[C\d+\]')
+_PKTLOSS_RE = re.compile(r'PktLoss: ([1-9]\d*)/100')
+
+# In-memory copy of the parsed config, keyed by file mtime, so reloads skip
+# the disk read + JSON parse when the file hasn't changed since the last save
+_CONFIG_CACHE = {'mtime': None, 'data': None}
+
+@functools.lru_cache(maxsize=1024)
+def _format_expires(raw):
+    """Format a ban expiry for display; memoized since active bans repeat across polls"""
+    if not raw:
+        return "Permanent"
+    expires = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    return expires.strftime("%Y-%m-%d %H:%M UTC")
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that buffers routine records, flushing only for
+    WARNING and above or once the flush interval has elapsed"""
+
+    def __init__(self, *args, flush_level=logging.WARNING, flush_interval=30.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._flush_level = flush_level
+        self._flush_interval = flush_interval
+        self._flush_due = False
+        self._last_flush = time.monotonic()
+        self._pos = 0  # Our own write position, see shouldRollover
+        self._pending = 0  # Length of the record currently being emitted
+
+    def _open(self):
+        # A block buffer lets consecutive INFO records coalesce into far
+        # fewer write() syscalls than the default line buffering
+        try:
+            self._pos = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._pos = 0
+        return open(self.baseFilename, self.mode, buffering=64*1024, encoding=self.encoding)
+
+    def shouldRollover(self, record):
+        # Same size check as the stdlib, but against an internally tracked
+        # position: the stock implementation seeks the stream before every
+        # record, and that seek flushes the block buffer above, forcing one
+        # write() per record and defeating the buffering entirely
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        self._pending = len("%s\n" % self.format(record))
+        return self._pos + self._pending >= self.maxBytes
+
+    def emit(self, record):
+        self._flush_due = record.levelno >= self._flush_level
+        super().emit(record)
+        self._pos += self._pending
+        self._pending = 0
+
+    def flush(self):
+        # StreamHandler.emit calls flush() after every record; only honour
+        # it for important records or when the interval has elapsed
+        now = time.monotonic()
+        if self._flush_due or now - self._last_flush >= self._flush_interval:
+            super().flush()
+            self._last_flush = now
+
+    def close(self):
+        self._flush_due = True
+        super().close()
+
+# Set up logging: records are enqueued from the event loop and written by a
+# background thread, so file writes and rotation never block a coroutine
 logger = logging.getLogger('TMuxBot')
 logger.setLevel(logging.INFO)
-handler = RotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=5)  # 5MB per file, keep 5 files
+handler = BufferedRotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=5, delay=True)  # 5MB per file, keep 5 files
 formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 handler.setFormatter(formatter)
-logger.addHandler(handler)
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, handler)
+_log_listener.start()
+# Safety net for exit paths that never reach bot.close()
+atexit.register(_log_listener.stop)
 
 class TMuxMonitorBot(commands.Bot):
     def __init__(self):
@@ -30,22 +126,114 @@ class TMuxMonitorBot(commands.Bot):
         intents.message_content = True
         super().__init__(command_prefix='!', intents=intents)
         
-        self.config = self.load_config()
         self.last_message_id = None
         self.current_players = 0
         self.session = None  # aiohttp session for API requests
+        # Adaptive ban polling: back off while the ban list is quiet and use
+        # ETags so unchanged responses come back as a body-less 304
+        self._ban_poll_interval = 60
+        self._next_ban_check = 0.0
+        self._bans_etag = None
+        self._bans_channel_obj = None  # Resolved bans channel, cached between polls
+        self._fps_channel_obj = None  # Resolved performance channel, cached between ticks
+        self._token_last_ok = 0.0  # monotonic time of the last authorized API response
+        self._bm_headers = None  # Prebuilt auth headers, set on first config access
+        self._bm_params = None  # Prebuilt /bans query params, set alongside the headers
+        self._battlemetrics_ready = False  # True once token, server id and channel are all set
+        self._owner_id_str = None  # Owner id, pre-stringified for is_owner checks
+        self._admin_role_id = None  # Admin role id, hoisted out of per-command config lookups
+        self._last_history_size = 0  # tmux scrollback size at the previous tick
+        self._capture_window = 1000  # Lines to capture next tick, sized from recent growth
+        self._config_dirty = False  # Set when config state changes in memory
+        self._config_flush_task = None  # Background task that persists dirty config
+        self._tree_sync_task = None  # Background task that syncs the command tree after startup
+        # Last good /bans response: short TTL to absorb bursty callers, kept
+        # around as a stale fallback when the API is unreachable
+        self._bans_cache = {'at': 0.0, 'body': None}
+        self._last_perf_key = None  # Snapshot of the last posted performance report
     
     async def setup_hook(self):
-        logger.info(f"Bot is ready and monitoring TMux session: {TMUX_SESSION}")
-        self.session = aiohttp.ClientSession()  # Initialize API session
+        logger.info("Bot is ready and monitoring TMux session: %s", TMUX_SESSION)
+        # One session for the lifetime of the bot so TCP/TLS connections to
+        # the BattleMetrics API are kept alive between polls
+        # The pool only ever talks to api.battlemetrics.com, so a handful of
+        # connections and a 5-minute DNS cache beat the 100-slot defaults
+        self.session = aiohttp.ClientSession(
+            headers={'Accept': 'application/json'},
+            timeout=aiohttp.ClientTimeout(total=30),
+            # keepalive_timeout outlives the 60s poll cadence so the TLS
+            # connection survives between ticks instead of being evicted
+            connector=aiohttp.TCPConnector(
+                limit=4, limit_per_host=4, keepalive_timeout=120, ttl_dns_cache=300
+            )
+        )
+        # Warm the lazy config on a worker thread so the first access doesn't
+        # pay the disk read + parse on the event loop
+        await asyncio.to_thread(getattr, self, 'config')
+        self._config_flush_task = asyncio.create_task(self._flush_config_loop())
         self.monitor_tmux.start()
+        # Syncing the tree can take seconds against the Discord API; run it in
+        # the background once the gateway is up instead of blocking startup
+        self._tree_sync_task = asyncio.create_task(self._deferred_tree_sync())
+
+    async def _deferred_tree_sync(self):
+        await self.wait_until_ready()
+        try:
+            await self._sync_tree_if_changed()
+        except Exception as e:
+            logger.error("Deferred command sync failed: %s", e, exc_info=True)
+
+    async def _sync_tree_if_changed(self):
+        """Sync the command tree only when its definition changed since last boot.
+
+        A global sync is a slow, heavily rate-limited Discord call; on
+        restart-heavy deployments skipping the no-op case saves seconds.
+        """
+        try:
+            payload = json.dumps(
+                [command.to_dict(self.tree) for command in self.tree.get_commands()],
+                sort_keys=True, default=str
+            ).encode('utf-8')
+            tree_hash = hashlib.sha1(payload).hexdigest()
+        except Exception as e:
+            logger.error("Could not fingerprint command tree, syncing anyway: %s", e)
+            tree_hash = None
+
+        if tree_hash:
+            try:
+                with open(SYNC_HASH_FILE, 'r') as f:
+                    if f.read().strip() == tree_hash:
+                        logger.info("Command tree unchanged, skipping sync")
+                        return
+            except FileNotFoundError:
+                pass
+
         await self.tree.sync()
+        logger.info("Command tree synced")
+        if tree_hash:
+            with open(SYNC_HASH_FILE, 'w') as f:
+                f.write(tree_hash)
 
     async def close(self):
+        if self._config_flush_task:
+            self._config_flush_task.cancel()
+        if self._tree_sync_task:
+            self._tree_sync_task.cancel()
+        # Persist anything still pending before shutdown
+        if self._config_dirty:
+            self._save_config_sync()
         if self.session:
             await self.session.close()
         await super().close()
 
+    @functools.cached_property
+    def config(self):
+        # Loaded lazily on first access so constructing the bot does no
+        # disk I/O; everything after that sees the cached dict
+        cfg = self.load_config()
+        self._refresh_config_state(cfg)
+        return cfg
+
     def load_config(self):
         default_config = {
             'fps_channel': None, #Separate channel for performance notifications
@@ -55,93 +243,271 @@ class TMuxMonitorBot(commands.Bot):
             'service_name': 'arma3server', #Ubuntu service name that can be restarted with /restart
             'last_message_id': None,
             'posted_bans': [],  # Track which bans we've posted
+            'last_ban_timestamp': None,  # Newest ban timestamp we've already posted
             'battlemetrics_token': None, #battlemetrics token you can generate at: https://www.battlemetrics.com/developers
             'battlemetrics_server_id': None #server id you can find by going to your server page at battle metrics exapmle: https://www.battlemetrics.com/servers/reforger/31762279 31762279 is the server id
         }
         
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                saved_config = json.load(f)
-                default_config.update(saved_config)
-        logger.info(f"Loaded config: {default_config}")
+        try:
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+            if mtime == _CONFIG_CACHE['mtime']:
+                saved_config = copy.deepcopy(_CONFIG_CACHE['data'])
+            else:
+                with open(CONFIG_FILE, 'rb') as f:
+                    raw = f.read()
+                saved_config = orjson.loads(raw) if orjson else json.loads(raw)
+                _CONFIG_CACHE['mtime'] = mtime
+                _CONFIG_CACHE['data'] = copy.deepcopy(saved_config)
+            default_config.update(saved_config)
+        except FileNotFoundError:
+            # First run: the file appears on the first save_config
+            pass
+
+        # Kept as a set in memory for O(1) membership checks, with a bounded
+        # FIFO deque tracking insertion order so the oldest IDs age out;
+        # serialized back to a list by _save_config_sync
+        posted_list = default_config.get('posted_bans') or []
+        self._posted_bans_order = deque(posted_list, maxlen=POSTED_BANS_MAX)
+        default_config['posted_bans'] = set(self._posted_bans_order)
+        logger.info("Loaded config: %s", default_config)
         
         self.last_message_id = default_config.get('last_message_id')
         return default_config
 
-    def save_config(self):
+    async def save_config(self):
+        # Mark-and-flush: callers just set the dirty flag and the background
+        # flusher coalesces bursts of changes into at most one write a second.
+        # Derived state is refreshed immediately so checks between now and the
+        # flush see the new values.
+        self._config_dirty = True
+        self._refresh_config_state()
+
+    async def _flush_config_loop(self):
+        while True:
+            await asyncio.sleep(1)
+            try:
+                if self._config_dirty:
+                    # Snapshot and serialize on the event loop so the worker
+                    # thread never iterates sets/deques the loop may mutate
+                    # mid-flush; only the finished bytes cross threads. The
+                    # flag is cleared up front so changes made during the
+                    # write are picked up by the next tick
+                    self._config_dirty = False
+                    payload, snapshot = self._serialize_config()
+                    try:
+                        await asyncio.to_thread(self._write_config_sync, payload, snapshot)
+                    except Exception:
+                        self._config_dirty = True
+                        raise
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A failed write (disk full, permissions) must not kill the
+                # flusher; the dirty flag stays set and the next tick retries
+                logger.error("Error flushing config: %s", e, exc_info=True)
+
+    def _serialize_config(self):
+        """Snapshot the live config and serialize it to bytes.
+
+        Must run on the event loop: it iterates the posted-bans deque and the
+        config dict, which handle_bans and the command handlers mutate freely.
+        """
         self.config['last_message_id'] = self.last_message_id
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(self.config, f)
-        logger.info(f"Saved config: {self.config}")
+        cfg_out = {**self.config, 'posted_bans': list(self._posted_bans_order)}
+        if orjson:
+            payload = orjson.dumps(cfg_out)
+        else:
+            payload = json.dumps(cfg_out).encode('utf-8')
+        return payload, cfg_out
+
+    def _write_config_sync(self, payload, snapshot):
+        # Write to a temp file and rename so a crash mid-write can never
+        # leave a torn config.json behind
+        tmp_file = CONFIG_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, CONFIG_FILE)
+        _CONFIG_CACHE['data'] = snapshot
+        _CONFIG_CACHE['mtime'] = os.stat(CONFIG_FILE).st_mtime_ns
+        logger.info("Saved config: %s", snapshot)
+
+    def _save_config_sync(self):
+        # Shutdown path: nothing else is mutating state, so snapshot and
+        # write can run back to back on the caller's thread
+        self._write_config_sync(*self._serialize_config())
+        self._config_dirty = False
+
+    def _refresh_config_state(self, cfg=None):
+        """Rebuild derived state that only changes when the config does"""
+        cfg = cfg if cfg is not None else self.config
+        self._owner_id_str = str(cfg['owner_id']) if cfg.get('owner_id') is not None else None
+        self._admin_role_id = cfg.get('admin_role')
+        token = cfg.get('battlemetrics_token')
+        if token:
+            self._bm_headers = {'Authorization': f"Bearer {token}"}
+            if self._bans_etag:
+                self._bm_headers['If-None-Match'] = self._bans_etag
+        else:
+            self._bm_headers = None
+        server_id = cfg.get('battlemetrics_server_id')
+        self._bm_params = {
+            'filter[server]': server_id,
+            'filter[expired]': 'false',
+            'include': 'user,server'
+        } if server_id else None
+        self._battlemetrics_ready = bool(
+            token and server_id and cfg.get('bans_channel')
+        )
 
     async def fetch_bans(self):
         """Fetch current bans from BattleMetrics API"""
-        if not self.config['battlemetrics_token'] or not self.config['battlemetrics_server_id']:
+        if self._bm_headers is None or self._bm_params is None:
             logger.error("BattleMetrics configuration is incomplete")
             return None
 
-        headers = {
-            'Authorization': f"Bearer {self.config['battlemetrics_token']}",
-            'Accept': 'application/json'
-        }
+        now = time.monotonic()
+        if self._bans_cache['body'] is not None and now - self._bans_cache['at'] < 30:
+            return self._bans_cache['body']
 
         try:
-            url = f"https://api.battlemetrics.com/bans"
-            params = {
-                'filter[server]': self.config['battlemetrics_server_id'],
-                'filter[expired]': 'false',
-                'include': 'user,server'
-            }
-
-            async with self.session.get(url, headers=headers, params=params) as response:
+            url = "https://api.battlemetrics.com/bans"
+
+            # Headers and params are prebuilt per config change; the tight
+            # per-request timeout keeps one hung poll from eating the whole
+            # session-level budget
+            async with self.session.get(
+                url,
+                headers=self._bm_headers,
+                params=self._bm_params,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
                 if response.status == 200:
-                    return await response.json()
+                    self._bans_etag = response.headers.get('ETag')
+                    if self._bans_etag:
+                        self._bm_headers['If-None-Match'] = self._bans_etag
+                    # A 200 proves the token works; no separate validation
+                    # round-trip is needed
+                    self._token_last_ok = time.monotonic()
+                    body = await response.read()
+                    loads = orjson.loads if orjson else json.loads
+                    # Parsing a large ban list blocks the event loop, so
+                    # push big payloads onto a worker thread
+                    if len(body) > 16 * 1024:
+                        data = await asyncio.to_thread(loads, body)
+                    else:
+                        data = loads(body)
+                    self._bans_cache['at'] = now
+                    self._bans_cache['body'] = data
+                    return data
+                elif response.status == 304:
+                    # Ban list unchanged since last poll, nothing to parse
+                    self._bans_cache['at'] = now
+                    return None
                 else:
-                    logger.error(f"Failed to fetch bans: {response.status}")
+                    logger.error("Failed to fetch bans: %s", response.status)
+                    if response.status in (401, 403) and self._token_last_ok:
+                        logger.error(
+                            "BattleMetrics token was accepted %.0fs ago; it may have been revoked",
+                            time.monotonic() - self._token_last_ok
+                        )
+                    # Only pull the body down when someone is actually
+                    # debugging; the 200 path stays a single json() read
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("BattleMetrics error response: %s", await response.text())
                     return None
         except Exception as e:
-            logger.error(f"Error fetching bans: {str(e)}")
+            logger.error("Error fetching bans: %s", e, exc_info=True)
+            if self._bans_cache['body'] is not None:
+                # Fall back to the last good response rather than skipping
+                # the whole pass while the API is unreachable
+                logger.warning("Using cached ban list after fetch failure")
+                return self._bans_cache['body']
             return None
 
+    async def _run_tmux(self, *args):
+        """Run a tmux command without blocking the event loop; returns stdout"""
+        proc = await asyncio.create_subprocess_exec(
+            'tmux', *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, ('tmux',) + args, stdout, stderr)
+        return stdout.decode('utf-8', 'replace')
+
+    def _get_bans_channel(self):
+        """Resolve the bans channel once and reuse it until the config changes"""
+        channel_id = self.config['bans_channel']
+        if self._bans_channel_obj is None or self._bans_channel_obj.id != channel_id:
+            self._bans_channel_obj = self.get_channel(channel_id)
+        return self._bans_channel_obj
+
+    def _get_fps_channel(self):
+        """Resolve the performance channel once and reuse it until the config changes"""
+        channel_id = self.config['fps_channel']
+        if self._fps_channel_obj is None or self._fps_channel_obj.id != channel_id:
+            self._fps_channel_obj = self.get_channel(channel_id)
+        return self._fps_channel_obj
+
     def format_performance_message(self, perf_data):
         if not perf_data:
             return "Error parsing server status"
 
-        message = [
-            "🖥️ **Server Performance Report**",
-            f"FPS: **{perf_data['fps']:.1f}** (Frame Time: avg {perf_data['frame_time_avg']:.1f}ms, max {perf_data['frame_time_max']:.1f}ms)",
-            f"Memory: **{perf_data['memory'] // 1024:,} MB**",
-            "",
-            "👥 **Server Population**",
-            f"Players: **{perf_data['players']}**",
-            f"AI Units: **{perf_data['ai']}**",
-            f"Vehicles: **{perf_data['vehicles']}**",
-            "",
-            "🌐 **Network Status**",
-            f"Connected Clients: **{perf_data['total_clients']}**",
+        # Adjacent literals concatenate at compile time, so this builds the
+        # message in one buffer without the intermediate list + join
+        return (
+            "🖥️ **Server Performance Report**\n"
+            f"FPS: **{perf_data['fps']:.1f}** (Frame Time: avg {perf_data['frame_time_avg']:.1f}ms, max {perf_data['frame_time_max']:.1f}ms)\n"
+            f"Memory: **{perf_data['memory'] // 1024:,} MB**\n"
+            "\n"
+            "👥 **Server Population**\n"
+            f"Players: **{perf_data['players']}**\n"
+            f"AI Units: **{perf_data['ai']}**\n"
+            f"Vehicles: **{perf_data['vehicles']}**\n"
+            "\n"
+            "🌐 **Network Status**\n"
+            f"Connected Clients: **{perf_data['total_clients']}**\n"
             f"Clients with Packet Loss: **{perf_data['packet_loss_clients']}**"
-        ]
-
-        return "\n".join(message)
+        )
 
     async def handle_bans(self, channel, bans_data):
-        """Handle posting of new bans"""
+        """Handle posting of new bans. Returns the number of bans posted."""
         if not bans_data or 'data' not in bans_data:
-            return
+            return 0
+
+        # Anything at or before the newest timestamp we've posted was already
+        # handled on an earlier poll; ISO-8601 strings compare chronologically
+        last_seen = self.config.get('last_ban_timestamp')
 
+        # Hoist the loop-invariant lookups out of the per-ban work
+        posted = self.config['posted_bans']
+        posted_order = self._posted_bans_order
+
+        # Build the messages for all unseen bans first, then send them
+        # concurrently so N new bans cost roughly one round-trip instead of N
+        new_bans = []
         for ban in bans_data['data']:
             try:
                 ban_id = ban.get('id')
-                
-                # Skip if we've already posted this ban
-                if ban_id in self.config['posted_bans']:
-                    continue
 
                 # Get ban attributes
                 attributes = ban['attributes']
+                timestamp = attributes.get('timestamp', '')
+
+                # Skip bans from before our resume point
+                if last_seen and timestamp and timestamp <= last_seen:
+                    continue
+
+                # Skip if we've already posted this ban
+                if ban_id in posted:
+                    continue
+
                 reason = attributes.get('reason', 'No reason provided')
                 expires = attributes.get('expires')
-                
+
                 # Get the name identifier
                 identifier = None
                 identifiers = attributes.get('identifiers', [])
@@ -149,36 +515,79 @@ class TMuxMonitorBot(commands.Bot):
                     if id_entry.get('type') == 'name':
                         identifier = id_entry.get('identifier')
                         break
-                
+
                 if not identifier:
                     identifier = 'Unknown'
-                
-                # Format expiration time
-                if expires:
-                    expires = datetime.fromisoformat(expires.replace('Z', '+00:00'))
-                    expires_str = expires.strftime("%Y-%m-%d %H:%M UTC")
-                else:
-                    expires_str = "Permanent"
-                
-                ban_message = (
-                    "🚫 **New Ban**\n"
-                    f"**Player**: {identifier}\n"
-                    f"**Reason**: {reason}\n"
-                    f"**Expires**: {expires_str}"
+
+                expires_str = _format_expires(expires)
+
+                embed = discord.Embed(
+                    title="🚫 New Ban",
+                    description=(
+                        f"**Player**: {identifier}\n"
+                        f"**Reason**: {reason}\n"
+                        f"**Expires**: {expires_str}"
+                    )
                 )
-                
-                # Post the ban message
-                await channel.send(ban_message)
-                
-                # Add to posted bans
-                self.config['posted_bans'].append(ban_id)
-                self.save_config()
-                logger.info(f"Posted new ban for player: {identifier}")
+
+                new_bans.append((ban_id, identifier, timestamp, embed))
 
             except Exception as e:
-                logger.error(f"Error posting ban entry: {str(e)}")
+                logger.error("Error formatting ban entry: %s", e, exc_info=True)
                 continue
 
+        if not new_bans:
+            return 0
+
+        # Discord accepts up to 10 embeds per message, so a backlog of N bans
+        # needs ceil(N / 10) sends instead of N; the semaphore keeps a big
+        # backfill under the per-channel rate limit
+        chunks = [new_bans[i:i + 10] for i in range(0, len(new_bans), 10)]
+        semaphore = asyncio.Semaphore(5)
+
+        async def send_chunk(chunk):
+            async with semaphore:
+                await channel.send(embeds=[embed for _, _, _, embed in chunk])
+
+        results = await asyncio.gather(
+            *(send_chunk(chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        posted_count = 0
+        posted_timestamps = []
+        failed_timestamps = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error("Error posting ban entries: %s", result, exc_info=result)
+                failed_timestamps.extend(ts for _, _, ts, _ in chunk if ts)
+                continue
+            for ban_id, identifier, timestamp, _ in chunk:
+                # The deque evicts its oldest entry once full; mirror that
+                # eviction in the membership set before appending
+                if len(posted_order) == POSTED_BANS_MAX:
+                    posted.discard(posted_order[0])
+                posted_order.append(ban_id)
+                posted.add(ban_id)
+                posted_count += 1
+                if timestamp:
+                    posted_timestamps.append(timestamp)
+                logger.info("Posted new ban for player: %s", identifier)
+
+        # One max() over the delivered bans replaces a compare-and-assign
+        # per iteration; ISO-8601 strings order chronologically. Never advance
+        # the resume point past an undelivered ban: anything in a failed chunk
+        # must stay ahead of last_ban_timestamp so the next poll retries it
+        # (posted_bans dedupes whatever did get through)
+        failed_floor = min(failed_timestamps, default=None)
+        if failed_floor:
+            posted_timestamps = [ts for ts in posted_timestamps if ts < failed_floor]
+        newest_seen = max(posted_timestamps, default=None)
+        if newest_seen and (not last_seen or newest_seen > last_seen):
+            self.config['last_ban_timestamp'] = newest_seen
+        self._config_dirty = True
+        return posted_count
+
     @tasks.loop(seconds=60)
     async def monitor_tmux(self):
         logger.info("Running monitoring loop...")
@@ -188,25 +597,43 @@ class TMuxMonitorBot(commands.Bot):
             return
             
         try:
-            # Get TMux performance data
-            cmd = f"tmux capture-pane -S -1000 -E -1 -t {TMUX_SESSION} -p"
-            output = subprocess.check_output(cmd, shell=True).decode('utf-8')
-            
-            # Look for player count
-            player_lines = [line.strip() for line in output.split('\n') 
-                        if 'NETWORK' in line and 'Players connected:' in line]
+            # One tmux fork per tick: chain display-message and capture-pane
+            # with ';' so history size and pane text come back together. The
+            # capture window is sized from the previous tick's scrollback
+            # growth (with 2x margin), since this tick's growth is only known
+            # once the combined output returns.
+            combined = await self._run_tmux(
+                'display-message', '-p', '-t', TMUX_SESSION, '#{history_size}', ';',
+                'capture-pane', '-S', f'-{self._capture_window}', '-E', '-1', '-t', TMUX_SESSION, '-p'
+            )
+            first_line, _, output = combined.partition('\n')
+            history_size = int(first_line.strip())
+            if history_size < self._last_history_size:
+                # Scrollback was cleared (e.g. server restart); start over
+                self._last_history_size = 0
+            growth = history_size - self._last_history_size
+            self._last_history_size = history_size
+            self._capture_window = min(1000, max(16, growth * 2))
+
+            # One pass over the captured text, keeping only the newest match
+            # in each category
+            player_line = None
+            latest_fps_line = None
+            for line in output.splitlines():
+                line = line.strip()
+                if 'NETWORK' in line and 'Players connected:' in line:
+                    player_line = line
+                elif line.startswith('DEFAULT') and 'FPS:' in line:
+                    latest_fps_line = line
+
             player_count = 0
-            if player_lines:
-                player_match = re.search(r'Players connected: (\d+)', player_lines[-1])
+            if player_line:
+                player_match = _PLAYERS_RE.search(player_line)
                 if player_match:
                     player_count = int(player_match.group(1))
-                    logger.info(f"Found player count: {player_count}")
-            
-            fps_lines = [line.strip() for line in output.split('\n') 
-                        if line.strip().startswith('DEFAULT') and 'FPS:' in line]
-            
-            if fps_lines:
-                latest_fps_line = fps_lines[-1]
+                    logger.info("Found player count: %s", player_count)
+
+            if latest_fps_line:
                 parsed_data = self.parse_fps_line(latest_fps_line)
                 
                 if parsed_data:
@@ -216,47 +643,74 @@ class TMuxMonitorBot(commands.Bot):
                         self.current_players = player_count
                         await self.update_presence()
 
+                    # Skip the delete/send round-trips entirely when nothing
+                    # the report shows has changed since the last tick
+                    perf_key = (
+                        round(parsed_data['fps']),
+                        parsed_data['players'],
+                        parsed_data['ai'],
+                        parsed_data['vehicles'],
+                        parsed_data['total_clients'],
+                        parsed_data['packet_loss_clients']
+                    )
+
                     # Handle performance updates
-                    performance_channel = self.get_channel(self.config['fps_channel'])
-                    if performance_channel:
+                    performance_channel = self._get_fps_channel()
+                    if performance_channel and perf_key != self._last_perf_key:
+                        perf_message = self.format_performance_message(parsed_data)
+
+                        # Editing the existing message is one REST call
+                        # instead of delete + send, and keeps the message id
+                        # stable so the config needs no rewrite
+                        edited = False
                         if self.last_message_id:
                             try:
                                 previous_message = await performance_channel.fetch_message(self.last_message_id)
-                                await previous_message.delete()
-                                logger.info(f"Deleted previous performance message: {self.last_message_id}")
+                                await previous_message.edit(content=perf_message)
+                                edited = True
                             except discord.NotFound:
-                                logger.warning(f"Previous performance message not found: {self.last_message_id}")
+                                logger.warning("Previous performance message not found: %s", self.last_message_id)
                             except Exception as e:
-                                logger.error(f"Error deleting previous performance message: {str(e)}")
-                        
-                        perf_message = self.format_performance_message(parsed_data)
-                        new_perf_message = await performance_channel.send(perf_message)
-                        self.last_message_id = new_perf_message.id
-                        self.save_config()
+                                logger.error("Error editing previous performance message: %s", e, exc_info=True)
+
+                        if not edited:
+                            new_perf_message = await performance_channel.send(perf_message)
+                            self.last_message_id = new_perf_message.id
+                            self._config_dirty = True
+                        self._last_perf_key = perf_key
 
                     # Handle ban updates
-                    if (self.config['battlemetrics_token'] and 
-                        self.config['battlemetrics_server_id'] and 
-                        self.config['bans_channel']):
-                        bans_channel = self.get_channel(self.config['bans_channel'])
-                        if bans_channel:
-                            bans_data = await self.fetch_bans()
-                            if bans_data:
-                                await self.handle_bans(bans_channel, bans_data)
+                    if self._battlemetrics_ready:
+                        now = time.monotonic()
+                        if now >= self._next_ban_check:
+                            posted = 0
+                            bans_channel = self._get_bans_channel()
+                            if bans_channel:
+                                bans_data = await self.fetch_bans()
+                                if bans_data:
+                                    posted = await self.handle_bans(bans_channel, bans_data)
+
+                            # Back off while nothing new shows up, snap back
+                            # to the base cadence as soon as a ban lands
+                            if posted:
+                                self._ban_poll_interval = 60
+                            else:
+                                self._ban_poll_interval = min(self._ban_poll_interval * 2, 600)
+                            self._next_ban_check = now + self._ban_poll_interval
 
                         logger.info("Successfully updated all messages")
                     else:
-                        logger.error(f"Could not find required channels or BattleMetrics configuration")
+                        logger.error("Could not find required channels or BattleMetrics configuration")
                 else:
                     logger.error("Failed to parse FPS data")
             else:
                 logger.warning("No FPS lines found in TMux output")
         
         except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to read TMux session: {TMUX_SESSION}")
-            logger.error(f"Error: {str(e)}")
+            logger.error("Failed to read TMux session: %s", TMUX_SESSION)
+            logger.error("Error: %s", e)
         except Exception as e:
-            logger.error(f"Error in monitor loop: {str(e)}")
+            logger.error("Error in monitor loop: %s", e, exc_info=True)
 
     @monitor_tmux.before_loop
     async def before_monitor(self):
@@ -276,9 +730,9 @@ class TMuxMonitorBot(commands.Bot):
                 name=f"{self.current_players}/128 Playing"
             )
             await self.change_presence(activity=activity)
-            logger.info(f"Updated presence: {self.current_players}/128 playing")
+            logger.info("Updated presence: %s/128 playing", self.current_players)
         except Exception as e:
-            logger.error(f"Error updating presence: {str(e)}")
+            logger.error("Error updating presence: %s", e)
     
     def has_role(self, member, role_id):
         if role_id is None:
@@ -286,15 +740,17 @@ class TMuxMonitorBot(commands.Bot):
         return any(role.id == role_id for role in member.roles)
     
     def is_owner(self, user_id):
-        return str(user_id) == str(self.config['owner_id'])
+        # Single precomputed string compare instead of a dict lookup plus
+        # two str() conversions per authorization check
+        return self._owner_id_str is not None and str(user_id) == self._owner_id_str
     
     def parse_fps_line(self, line):
         try:
-            fps_match = re.search(r'FPS: ([\d.]+)', line)
-            frame_time_match = re.search(r'frame time \(avg: ([\d.]+) ms, min: ([\d.]+) ms, max: ([\d.]+) ms\)', line)
-            mem_match = re.search(r'Mem: (\d+)', line)
-            ai_match = re.search(r'AI: (\d+)', line)
-            veh_match = re.search(r'Veh: (\d+)\s*\(', line)
+            fps_match = _FPS_RE.search(line)
+            frame_time_match = _FRAME_TIME_RE.search(line)
+            mem_match = _MEM_RE.search(line)
+            ai_match = _AI_RE.search(line)
+            veh_match = _VEH_RE.search(line)
 
             if not fps_match:
                 logger.warning("No FPS match found in line")
@@ -311,14 +767,14 @@ class TMuxMonitorBot(commands.Bot):
                 'memory': int(mem_match.group(1)) if mem_match else 0,
                 'ai': ai_count,
                 'vehicles': vehicle_count,
-                'total_clients': len(re.findall(r'\[C\d+\]', line)),
-                'packet_loss_clients': len(re.findall(r'PktLoss: ([1-9]\d*)/100', line))
+                'total_clients': len(_CLIENT_RE.findall(line)),
+                'packet_loss_clients': len(_PKTLOSS_RE.findall(line))
             }
             
-            logger.debug(f"Parsed data: {data}")
+            logger.debug("Parsed data: %s", data)
             return data
         except Exception as e:
-            logger.error(f"Error parsing FPS line: {str(e)}")
+            logger.error("Error parsing FPS line: %s", e, exc_info=True)
             return None
 # Create the bot instance
 bot = TMuxMonitorBot()
@@ -330,24 +786,24 @@ async def set_owner(interaction: discord.Interaction, user_id: str):
         return
     
     bot.config['owner_id'] = user_id
-    bot.save_config()
+    await bot.save_config()
     await interaction.response.send_message(f"Owner has been set to user ID: {user_id}", ephemeral=True)
 
 @bot.tree.command(name="fps-channel", description="Set the channel for performance updates")
 async def set_fps_channel(interaction: discord.Interaction):
     bot.config['fps_channel'] = interaction.channel_id
-    bot.save_config()
-    await interaction.response.send_message(f"Performance updates will now be sent to this channel!", ephemeral=True)
+    await bot.save_config()
+    await interaction.response.send_message("Performance updates will now be sent to this channel!", ephemeral=True)
 
 @bot.tree.command(name="set-bans-channel", description="Set the channel for ban notifications")
 async def set_bans_channel(interaction: discord.Interaction):
-    if not bot.has_role(interaction.user, bot.config['admin_role']) and not bot.is_owner(interaction.user.id):
+    if not bot.has_role(interaction.user, bot._admin_role_id) and not bot.is_owner(interaction.user.id):
         await interaction.response.send_message("You need the admin role to use this command!", ephemeral=True)
         return
     
     bot.config['bans_channel'] = interaction.channel_id
-    bot.save_config()
-    await interaction.response.send_message(f"Ban notifications will now be sent to this channel!", ephemeral=True)
+    await bot.save_config()
+    await interaction.response.send_message("Ban notifications will now be sent to this channel!", ephemeral=True)
 
 @bot.tree.command(name="set-admin-role", description="Set the admin role (Owner only)")
 async def set_admin_role(interaction: discord.Interaction, role: discord.Role):
@@ -356,22 +812,22 @@ async def set_admin_role(interaction: discord.Interaction, role: discord.Role):
         return
     
     bot.config['admin_role'] = role.id
-    bot.save_config()
+    await bot.save_config()
     await interaction.response.send_message(f"Admin role has been set to {role.name}", ephemeral=True)
 
 @bot.tree.command(name="set-service", description="Set the service name to restart")
 async def set_service(interaction: discord.Interaction, service_name: str):
-    if not bot.has_role(interaction.user, bot.config['admin_role']):
+    if not bot.has_role(interaction.user, bot._admin_role_id):
         await interaction.response.send_message("You need the admin role to use this command!", ephemeral=True)
         return
     
     bot.config['service_name'] = service_name
-    bot.save_config()
+    await bot.save_config()
     await interaction.response.send_message(f"Service name has been set to {service_name}", ephemeral=True)
 
 @bot.tree.command(name="restart", description="Restart the server service")
 async def restart_service(interaction: discord.Interaction):
-    if not bot.has_role(interaction.user, bot.config['admin_role']):
+    if not bot.has_role(interaction.user, bot._admin_role_id):
         await interaction.response.send_message("You don't have permission to restart the service!", ephemeral=True)
         return
     
@@ -396,7 +852,7 @@ async def set_battlemetrics(
     
     bot.config['battlemetrics_token'] = api_token
     bot.config['battlemetrics_server_id'] = server_id
-    bot.save_config()
+    await bot.save_config()
     await interaction.response.send_message("BattleMetrics configuration has been updated!", ephemeral=True)
 
 @bot.tree.command(name="clear-bans", description="Clear the list of posted bans (Owner only)")
@@ -405,8 +861,12 @@ async def clear_bans(interaction: discord.Interaction):
         await interaction.response.send_message("Only the owner can use this command!", ephemeral=True)
         return
     
-    bot.config['posted_bans'] = []
-    bot.save_config()
+    bot.config['posted_bans'] = set()
+    bot._posted_bans_order.clear()
+    # Also drop the resume point, otherwise handle_bans keeps filtering out
+    # everything at or before it and the cleared bans are never re-posted
+    bot.config['last_ban_timestamp'] = None
+    await bot.save_config()
     await interaction.response.send_message("Posted bans list has been cleared!", ephemeral=True)
 
 if __name__ == "__main__":
@@ -415,5 +875,32 @@ if __name__ == "__main__":
         logger.error("DISCORD_TOKEN environment variable not set")
         raise ValueError("Please set the DISCORD_TOKEN environment variable")
     
+    # uvloop is a drop-in, faster event loop for asyncio; optional and not
+    # available on Windows
+    loop_factory = None
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            pass
+
+    async def main():
+        async with bot:
+            await bot.start(TOKEN)
+
+    # bot.run() would normally install discord.py's default logging; keep it
+    # so the library's gateway, rate-limit and heartbeat warnings still have
+    # a handler after the switch to asyncio.Runner
+    discord.utils.setup_logging()
+
     logger.info("Starting bot...")
-    bot.run(TOKEN)
\ No newline at end of file
+    # Run the bot directly on an asyncio.Runner instead of bot.run(), which
+    # wraps startup in extra setup/teardown layers; this also lets uvloop be
+    # supplied as the loop factory rather than globally installed
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        try:
+            runner.run(main())
+        except KeyboardInterrupt:
+            pass
\ No newline at end of file